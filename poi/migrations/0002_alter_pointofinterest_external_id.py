@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-08-28 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pointofinterest',
+            name='external_id',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+    ]
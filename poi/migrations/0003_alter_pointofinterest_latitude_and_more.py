@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-08-28 08:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poi', '0002_alter_pointofinterest_external_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pointofinterest',
+            name='latitude',
+            field=models.DecimalField(decimal_places=7, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='pointofinterest',
+            name='longitude',
+            field=models.DecimalField(decimal_places=7, max_digits=10),
+        ),
+        migrations.AddConstraint(
+            model_name='pointofinterest',
+            constraint=models.CheckConstraint(condition=models.Q(('latitude__gte', -90), ('latitude__lte', 90)), name='poi_latitude_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='pointofinterest',
+            constraint=models.CheckConstraint(condition=models.Q(('longitude__gte', -180), ('longitude__lte', 180)), name='poi_longitude_range'),
+        ),
+    ]
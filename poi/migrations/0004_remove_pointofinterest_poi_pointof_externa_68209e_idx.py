@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-08-28 09:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poi', '0003_alter_pointofinterest_latitude_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='pointofinterest',
+            name='poi_pointof_externa_68209e_idx',
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Q
 
 
 class PointOfInterest(models.Model):
@@ -7,27 +7,31 @@ class PointOfInterest(models.Model):
     internal_id = models.AutoField(primary_key=True)
     
     # External ID from the source file
-    external_id = models.CharField(max_length=100, db_index=True)
+    external_id = models.CharField(max_length=100, unique=True)
     
     # PoI name
     name = models.CharField(max_length=255)
     
-    # Coordinates
+    # Coordinates. Ranges are enforced by CHECK constraints (see Meta)
+    # rather than Python validators, so bulk inserts are validated by the
+    # database instead of per-assignment Python calls.
     latitude = models.DecimalField(
-        max_digits=10, 
-        decimal_places=7,
-        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+        max_digits=10,
+        decimal_places=7
     )
     longitude = models.DecimalField(
-        max_digits=10, 
-        decimal_places=7,
-        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+        max_digits=10,
+        decimal_places=7
     )
     
     # Category
     category = models.CharField(max_length=100, db_index=True)
     
-    # Ratings (stored as JSON array of individual ratings)
+    # Ratings (stored as JSON array of individual ratings).
+    # Kept as JSONField rather than a Postgres numeric[] ArrayField so the
+    # model works on every backend the project runs on (sqlite in
+    # development); avg_rating is precomputed at import time instead of
+    # being derived server-side.
     ratings_data = models.JSONField(default=list, blank=True)
     
     # Average rating (calculated field)
@@ -49,17 +53,28 @@ class PointOfInterest(models.Model):
         verbose_name = "Point of Interest"
         verbose_name_plural = "Points of Interest"
         ordering = ['name']
+        # external_id is covered by its unique index; no separate entry
         indexes = [
-            models.Index(fields=['external_id']),
             models.Index(fields=['category']),
             models.Index(fields=['avg_rating']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(latitude__gte=-90) & Q(latitude__lte=90),
+                name='poi_latitude_range',
+            ),
+            models.CheckConstraint(
+                condition=Q(longitude__gte=-180) & Q(longitude__lte=180),
+                name='poi_longitude_range',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.external_id})"
     
     def save(self, *args, **kwargs):
-        # Calculate average rating before saving
+        # Calculate average rating before saving. The bulk importer
+        # bypasses save() entirely and precomputes this itself.
         if self.ratings_data:
             try:
                 ratings = [float(r) for r in self.ratings_data if r is not None]